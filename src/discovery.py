@@ -2,6 +2,7 @@ import os
 import json
 import re
 import logging
+from functools import lru_cache, partial
 
 logger = logging.getLogger("Discovery")
 
@@ -14,6 +15,9 @@ SUPPORTED_EXTENSIONS = (
 DEFAULT_ENTITY_ICON = "mdi:radio-tower"
 CACHE_FILENAME = ".discovery_cache.json"
 
+# Anything outside [a-zA-Z0-9_-] is replaced when building MQTT topics / IDs.
+_SANITIZE_RE = re.compile(r"[^a-zA-Z0-9_-]")
+
 
 # ---------------------------------------------------------------------------
 # Icon defaults / heuristics
@@ -47,7 +51,18 @@ ICON_KEYWORDS = [
     ("radio", "mdi:radio-tower"),
 ]
 
+# All keywords folded into one pattern so a name is scanned in a single pass.
+# The lookahead makes matches zero-width, so overlapping keywords ("lock" /
+# "unlock") are all seen; at a given position the alternation prefers the
+# keyword listed first.
+_KW_INDEX = {}
+for _i, (_kw, _icon) in enumerate(ICON_KEYWORDS):
+    _KW_INDEX.setdefault(_kw, _i)
+_KW_RE = re.compile("(?=(" + "|".join(re.escape(kw) for kw, _icon in ICON_KEYWORDS) + "))")
+
 # File extension defaults (used only if no keyword match and no overrides).
+# Also the only compound extensions _ext_for_file() recognizes, so any
+# multi-dot entry in SUPPORTED_EXTENSIONS must appear here.
 ICON_BY_EXTENSION = {
     ".sub": "mdi:remote",
     ".rfcat.json": "mdi:radio-tower",
@@ -55,14 +70,27 @@ ICON_BY_EXTENSION = {
 }
 
 
+# Button discovery payload with a fixed shape. Every %s slot takes an
+# already JSON-encoded value (json.dumps), so only per-entity strings are
+# escaped per file. Spacing matches json.dumps() defaults.
+# The "device" object is the same for every file in a folder, so it is
+# rendered once per folder and spliced in.
+_DEVICE_TEMPLATE = '{"identifiers": [%s], "name": %s, "model": %s, "manufacturer": %s, "via_device": %s}'
+_BUTTON_TEMPLATE = (
+    '{"name": %s, "unique_id": %s, "command_topic": %s, "payload_press": "PRESS", '
+    '"icon": %s, "device": %s}'
+)
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 def sanitize(text):
-    return re.sub(r"[^a-zA-Z0-9_-]", "_", text).lower()
+    return _SANITIZE_RE.sub("_", text).lower()
 
 
+@lru_cache(maxsize=4096)
 def _strip_known_suffix(filename: str) -> str:
     fn = filename
     for suf in (".rfcat.json",):
@@ -121,13 +149,23 @@ def _read_first_line(path: str):
 
 
 def _guess_icon_from_text(text: str):
-    t = (text or "").lower()
-    for kw, icon in ICON_KEYWORDS:
-        if kw in t:
-            return icon
-    return None
+    """Return the icon of the earliest-listed keyword found in text (or None)."""
+    return _guess_icon_lower((text or "").lower())
 
 
+@lru_cache(maxsize=4096)
+def _guess_icon_lower(t: str):
+    best = None
+    for m in _KW_RE.finditer(t):
+        idx = _KW_INDEX[m.group(1)]
+        if best is None or idx < best:
+            best = idx
+            if idx == 0:
+                break
+    return ICON_KEYWORDS[best][1] if best is not None else None
+
+
+@lru_cache(maxsize=4096)
 def _ext_for_file(filename: str):
     low = filename.lower()
     for ext in ICON_BY_EXTENSION.keys():
@@ -136,35 +174,98 @@ def _ext_for_file(filename: str):
     return os.path.splitext(low)[1]
 
 
-def _find_folder_icon(root_dir: str, stop_dir: str, default_icon: str, cache: dict):
+def _scan_tree(top: str):
+    """
+    Top-down directory walk (like os.walk) that yields
+    (root, file_names, name_set) from a single os.scandir() per directory,
+    so sidecar/marker lookups become set membership tests instead of stat()s.
+    Symlinked directories are listed but not descended into (os.walk default).
+    """
+    try:
+        with os.scandir(top) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    files = []
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+            is_link = is_dir and entry.is_symlink()
+        except OSError:
+            is_dir = is_link = False
+        if not is_dir:
+            files.append(entry.name)
+        elif not is_link:
+            subdirs.append(entry.path)
+
+    yield top, files, {entry.name for entry in entries}
+
+    for sub in subdirs:
+        yield from _scan_tree(sub)
+
+
+def _has_marker(d: str, marker_cache: dict) -> bool:
+    """Whether directory d contains a .mdi-icon file (stat'd at most once per dir)."""
+    found = marker_cache.get(d)
+    if found is None:
+        found = os.path.exists(os.path.join(d, ".mdi-icon"))
+        marker_cache[d] = found
+    return found
+
+
+def _nearest_mdi_icon(d: str, stop: str, marker_cache: dict, nearest_cache: dict):
+    """
+    Icon from the nearest .mdi-icon in d or its ancestors (up to stop), or None.
+    Memoized per directory, so once a parent is resolved every child below it
+    is an O(1) lookup instead of re-walking the whole ancestor chain.
+    """
+    if d in nearest_cache:
+        return nearest_cache[d]
+
+    icon = None
+    if _has_marker(d, marker_cache):
+        icon = _normalize_mdi_icon(_read_first_line(os.path.join(d, ".mdi-icon")))
+    if icon is None and d != stop:
+        parent = os.path.dirname(d)
+        if parent != d:
+            icon = _nearest_mdi_icon(parent, stop, marker_cache, nearest_cache)
+
+    nearest_cache[d] = icon
+    return icon
+
+
+def _find_folder_icon(
+    abs_root: str,
+    stop: str,
+    default_icon: str,
+    cache: dict,
+    marker_cache=None,
+    nearest_cache=None,
+):
     """
     Folder icon resolution:
-      1) nearest .mdi-icon file (walking up to stop_dir)
+      1) nearest .mdi-icon file (walking up to stop)
       2) keyword guess from relative path
       3) default_icon
-    Cached by absolute root_dir.
+    Both paths must already be absolute (run_discovery normalizes once).
+    Cached by abs_root. marker_cache maps absolute dir -> "has .mdi-icon"
+    (pre-filled from the discovery scan) so ancestors are not re-stat'd;
+    nearest_cache holds each directory's resolved .mdi-icon (or None).
     """
-    abs_root = os.path.abspath(root_dir)
     if abs_root in cache:
         return cache[abs_root]
 
-    stop = os.path.abspath(stop_dir)
+    if marker_cache is None:
+        marker_cache = {}
+    if nearest_cache is None:
+        nearest_cache = {}
 
-    d = abs_root
-    while True:
-        candidate = os.path.join(d, ".mdi-icon")
-        if os.path.exists(candidate):
-            icon = _normalize_mdi_icon(_read_first_line(candidate))
-            if icon:
-                cache[abs_root] = icon
-                return icon
-
-        if d == stop:
-            break
-        parent = os.path.dirname(d)
-        if parent == d:
-            break
-        d = parent
+    icon = _nearest_mdi_icon(abs_root, stop, marker_cache, nearest_cache)
+    if icon:
+        cache[abs_root] = icon
+        return icon
 
     # No explicit .mdi-icon found — try keyword guess based on relative path
     try:
@@ -177,22 +278,25 @@ def _find_folder_icon(root_dir: str, stop_dir: str, default_icon: str, cache: di
     return icon
 
 
-def _find_file_icon(root: str, filename: str, stem: str, folder_icon: str):
+def _find_file_icon(root: str, filename: str, stem: str, folder_icon: str, names=None):
     """
     File icon resolution:
       1) sidecar <stem>.icon (or <filename>.icon)
       2) keyword guess from stem
       3) extension default
       4) folder_icon
+    names is the directory listing of root (if known), used instead of stat().
+    folder_icon may be a zero-arg callable so it is only resolved when reached.
     """
     # sidecar options
-    sidecars = [
-        os.path.join(root, f"{stem}.icon"),
-        os.path.join(root, f"{filename}.icon"),  # allows "thing.sub.icon"
-    ]
+    sidecars = (
+        f"{stem}.icon",
+        f"{filename}.icon",  # allows "thing.sub.icon"
+    )
     for sc in sidecars:
-        if os.path.exists(sc):
-            icon = _normalize_mdi_icon(_read_first_line(sc))
+        present = (sc in names) if names is not None else os.path.exists(os.path.join(root, sc))
+        if present:
+            icon = _normalize_mdi_icon(_read_first_line(os.path.join(root, sc)))
             if icon:
                 return icon
 
@@ -204,7 +308,7 @@ def _find_file_icon(root: str, filename: str, stem: str, folder_icon: str):
     if ext in ICON_BY_EXTENSION:
         return ICON_BY_EXTENSION[ext]
 
-    return folder_icon
+    return folder_icon() if callable(folder_icon) else folder_icon
 
 
 # ---------------------------------------------------------------------------
@@ -217,8 +321,8 @@ def run_discovery(client, config):
 
     # Only expose *.py scripts as buttons when explicitly enabled.
     allow_py = bool(files_cfg.get("allow_python_scripts", False))
-    supported_exts = SUPPORTED_EXTENSIONS if allow_py else tuple(
-        e for e in SUPPORTED_EXTENSIONS if e != ".py"
+    supported_exts = frozenset(
+        e for e in SUPPORTED_EXTENSIONS if allow_py or e != ".py"
     )
 
     sub_dir = files_cfg["sub_directory"]
@@ -278,21 +382,42 @@ def run_discovery(client, config):
         return topic_map
 
     folder_icon_cache = {}
+    marker_cache = {}
+    nearest_cache = {}
+
+    # Constant parts of every button payload, encoded once.
+    model_json = json.dumps(model)
+    manufacturer_json = json.dumps(manufacturer)
+    node_id_json = json.dumps(node_id)
 
     # Scan Files
-    for root, dirs, files in os.walk(sub_dir):
-        supported_files = [f for f in files if f.lower().endswith(supported_exts)]
+    # Walk from the absolute path so every yielded root is already absolute.
+    abs_sub = os.path.abspath(sub_dir)
+    for root, files, names in _scan_tree(abs_sub):
+        marker_cache[root] = ".mdi-icon" in names
+        supported_files = [f for f in files if _ext_for_file(f) in supported_exts]
         if not supported_files:
             continue
 
         folder_name = os.path.basename(root)
-        is_root = (os.path.abspath(root) == os.path.abspath(sub_dir))
+        is_root = (root == abs_sub)
 
         device_name = "Misc Files" if is_root else folder_name.replace("_", " ")
         device_suffix = "main" if is_root else sanitize(folder_name)
         device_id = f"{node_id}_{device_suffix}"
 
-        folder_icon = _find_folder_icon(root, sub_dir, default_icon, folder_icon_cache)
+        device_json = _DEVICE_TEMPLATE % (
+            json.dumps(device_id),
+            json.dumps(device_name),
+            model_json,
+            manufacturer_json,
+            node_id_json,
+        )
+
+        # Resolved (and cached per folder) only if a file falls through to it.
+        folder_icon = partial(
+            _find_folder_icon, root, abs_sub, default_icon, folder_icon_cache, marker_cache, nearest_cache
+        )
 
         for f in supported_files:
             stem = _strip_known_suffix(f)
@@ -304,31 +429,22 @@ def run_discovery(client, config):
 
             topic_map[cmd_topic] = os.path.join(root, f)
 
-            file_icon = _find_file_icon(root, f, stem, folder_icon)
-
-            client.publish(
-                disc_topic,
-                json.dumps(
-                    {
-                        "name": stem.replace("_", " "),
-                        "unique_id": unique_id,
-                        "command_topic": cmd_topic,
-                        "payload_press": "PRESS",
-                        "icon": file_icon,
-                        "device": {
-                            "identifiers": [device_id],
-                            "name": device_name,
-                            "model": model,
-                            "manufacturer": manufacturer,
-                            "via_device": node_id,
-                        },
-                    }
-                ),
-                retain=True,
+            file_icon = _find_file_icon(root, f, stem, folder_icon, names)
+
+            payload = _BUTTON_TEMPLATE % (
+                json.dumps(stem.replace("_", " ")),
+                json.dumps(unique_id),
+                json.dumps(cmd_topic),
+                json.dumps(file_icon),
+                device_json,
             )
-            client.subscribe(cmd_topic)
+            client.publish(disc_topic, payload, retain=True)
             current_topics.add(disc_topic)
 
+    # One SUBSCRIBE packet carrying every command topic instead of one per button.
+    if topic_map:
+        client.subscribe([(t, 0) for t in topic_map])
+
     # Cleanup stale (default)
     if cleanup_mode == "stale":
         stale = previous_topics - current_topics
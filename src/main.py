@@ -11,16 +11,19 @@ Key design goals for this file:
 
 from __future__ import annotations
 
+import base64
+import binascii
 import builtins
 import os
 import re
 import time
-import runpy
-import signal
-import traceback
+import sys
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional
+from functools import cache, lru_cache
+from typing import Any, Callable, Dict, Optional
 
 import paho.mqtt.client as mqtt
 
@@ -48,6 +51,28 @@ c_white = "\033[1;37m"
 c_dim = "\033[37m"
 c_reset = "\033[0m"
 
+# "[Source] message" prefix used by the pretty printer.
+_SRC_RE = re.compile(r"^\[(.*?)\]\s*(.*)")
+
+# First `version:` line of config.yaml (value without surrounding quotes).
+_VERSION_RE = re.compile(rb"^[ \t]*version:[ \t]*[\"']?([^\"'\r\n]*)", re.M)
+
+# Bytes dropped from hex payload strings in TxScriptContext.tx_hex().
+_NON_HEX_BYTES = bytes(c for c in range(256) if chr(c) not in "0123456789abcdefABCDEF")
+
+# Precomposed level headers.
+_HDR_INFO = f"{c_green}INFO{c_reset}{c_white}:{c_reset}"
+_HDR_ERROR = f"{c_red}ERROR{c_reset}{c_white}:{c_reset}"
+_HDR_WARN = f"{c_yellow}WARN{c_reset}{c_white}:{c_reset}"
+_HDR_TX = f"{c_cyan}TX{c_reset}{c_white}  :{c_reset}"
+_HDR_MQTT = f"{c_magenta}MQTT{c_reset}{c_white}:{c_reset}"
+
+# One pass over the message; the group that matched is the keyword's priority
+# tier (lower wins). A message starting with "tx" is treated as TX after tiers
+# 1-3 and before MQTT.
+_LOG_CLASSIFY = re.compile(r"(error|critical|failed|crashed|exception)|(warn)|(transmitting|replay)|(mqtt)", re.I)
+_TIER_HEADERS = (None, _HDR_ERROR, _HDR_WARN, _HDR_TX)
+
 
 def _get_source_color(clean_text: str) -> str:
     clean = clean_text.lower()
@@ -60,44 +85,91 @@ def _get_source_color(clean_text: str) -> str:
     return c_green
 
 
+def _pick_header(msg: str) -> str:
+    tier = 5
+    for m in _LOG_CLASSIFY.finditer(msg):
+        if m.lastindex < tier:
+            tier = m.lastindex
+            if tier == 1:
+                break
+    if tier <= 3:
+        return _TIER_HEADERS[tier]
+    if msg[:2].lower() == "tx":
+        return _HDR_TX
+    if tier == 4:
+        return _HDR_MQTT
+    return _HDR_INFO
+
+
 def _make_timestamped_print(original_print):
+    now = datetime.now
+
     def timestamped_print(*args, **kwargs):
-        now = datetime.now().strftime("%H:%M:%S")
-        time_prefix = f"{c_dim}[{now}]{c_reset}"
+        time_prefix = f"{c_dim}[{now():%H:%M:%S}]{c_reset}"
         msg = " ".join(map(str, args))
-        lower_msg = msg.lower()
-
-        header = f"{c_green}INFO{c_reset}{c_white}:{c_reset}"
-        if any(x in lower_msg for x in ["error", "critical", "failed", "crashed", "exception"]):
-            header = f"{c_red}ERROR{c_reset}{c_white}:{c_reset}"
-        elif "warning" in lower_msg or "warn" in lower_msg:
-            header = f"{c_yellow}WARN{c_reset}{c_white}:{c_reset}"
-        elif "transmitting" in lower_msg or "replay" in lower_msg or lower_msg.startswith("tx"):
-            header = f"{c_cyan}TX{c_reset}{c_white}  :{c_reset}"
-        elif "mqtt" in lower_msg:
-            header = f"{c_magenta}MQTT{c_reset}{c_white}:{c_reset}"
-
-        match = re.match(r"^\[(.*?)\]\s*(.*)", msg)
+        header = _pick_header(msg)
+
+        match = _SRC_RE.match(msg)
         if match:
             src_text = match.group(1)
             rest_of_msg = match.group(2)
             s_color = _get_source_color(src_text)
             msg = f"{c_white}[{c_reset}{s_color}{src_text}{c_reset}{c_white}]:{c_reset} {rest_of_msg}"
 
-        # Avoid double-flush kwarg collisions.
-        if "flush" not in kwargs:
+        # Only problems force a flush; everything else rides the stream's own
+        # buffering (line-buffered, see install_pretty_print; run.sh uses -u).
+        if "flush" not in kwargs and (header is _HDR_ERROR or header is _HDR_WARN):
             kwargs["flush"] = True
-        original_print(f"{time_prefix} {header} {msg}", **kwargs)
+        # Pass the terminator with the line so an unbuffered stdout does one write().
+        end = kwargs.pop("end", None)
+        if end is None:
+            end = "\n"
+        original_print(f"{time_prefix} {header} {msg}{end}", end="", **kwargs)
 
     return timestamped_print
 
 
+def _make_plain_print(original_print):
+    """Timestamp-only print for uncolored output (no classification or ANSI codes)."""
+    now = datetime.now
+
+    def plain_print(*args, **kwargs):
+        end = kwargs.pop("end", None)
+        if end is None:
+            end = "\n"
+        original_print(f"[{now():%H:%M:%S}] {' '.join(map(str, args))}{end}", end="", **kwargs)
+
+    return plain_print
+
+
+def _color_enabled(stream: Any) -> bool:
+    """NO_COLOR disables, CLICOLOR_FORCE (non-"0") forces, otherwise only on a TTY."""
+    if os.environ.get("NO_COLOR"):
+        return False
+    force = os.environ.get("CLICOLOR_FORCE")
+    if force and force != "0":
+        return True
+    try:
+        return bool(stream.isatty())
+    except Exception:
+        return False
+
+
 def install_pretty_print() -> None:
-    """Install timestamped, colored print. Safe to call multiple times."""
+    """Install timestamped (and, if enabled, colored) print. Safe to call multiple times."""
     if getattr(install_pretty_print, "_installed", False):
         return
     original_print = builtins.print
-    builtins.print = _make_timestamped_print(original_print)
+    if _color_enabled(sys.stdout):
+        builtins.print = _make_timestamped_print(original_print)
+    else:
+        builtins.print = _make_plain_print(original_print)
+    # Without the per-line flush, keep INFO lines prompt when stdout is a pipe
+    # (e.g. systemd) rather than block-buffered.
+    try:
+        sys.stdout.reconfigure(line_buffering=True)  # type: ignore[union-attr]
+    except Exception:
+        pass
     install_pretty_print._installed = True  # type: ignore[attr-defined]
 
 
@@ -105,8 +177,9 @@ def install_pretty_print() -> None:
 # Version (read from config.yaml like rtl-haos)
 # ---------------------------------------------------------------------------
 
+@cache
 def get_version() -> str:
-    """Return a display version like 'v0.5.1' (or 'Unknown')."""
+    """Return a display version like 'v0.5.1' (or 'Unknown'). Resolved once per process."""
     env_ver = (os.getenv("CATFLAP_VERSION") or os.getenv("BUILD_VERSION") or "").strip()
     if env_ver:
         return env_ver if env_ver.lower().startswith("v") else f"v{env_ver}"
@@ -121,14 +194,12 @@ def get_version() -> str:
     for path in candidates:
         try:
             if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        s = line.strip()
-                        if s.startswith("version:"):
-                            v = s.split(":", 1)[1].strip().strip('"').strip("'")
-                            if not v:
-                                break
-                            return v if v.lower().startswith("v") else f"v{v}"
+                with open(path, "rb") as f:
+                    m = _VERSION_RE.search(f.read())
+                if m:
+                    v = m.group(1).decode("utf-8", errors="ignore").strip()
+                    if v:
+                        return v if v.lower().startswith("v") else f"v{v}"
         except Exception:
             pass
 
@@ -138,16 +209,13 @@ def get_version() -> str:
 # ---------------------------------------------------------------------------
 # ASCII logo (shown on direct execution only)
 # ---------------------------------------------------------------------------
+# Border chars switch to blue and back to white; everything else stays white.
+_BORDER_TABLE = str.maketrans({ch: f"{c_blue}{ch}{c_reset}{c_white}" for ch in "+-|"})
+
+
 def _colorize_border(line: str) -> str:
     """Color border characters blue, everything else white."""
-    border_chars = set("+-|-")  # includes '-'
-    out = []
-    for ch in line:
-        if ch in border_chars:
-            out.append(f"{c_blue}{ch}{c_reset}")
-        else:
-            out.append(f"{c_white}{ch}{c_reset}")
-    return "".join(out)
+    return f"{c_white}{line.translate(_BORDER_TABLE)}{c_reset}"
 
 
 def show_logo(version: str) -> None:
@@ -198,11 +266,66 @@ def show_logo(version: str) -> None:
 # ---------------------------------------------------------------------------
 
 
+# Distinct topics waiting while the radio is busy; beyond this the oldest press is dropped.
+TX_QUEUE_SIZE = 128
+# How long run() waits on shutdown for the worker to finish queued presses.
+TX_WORKER_JOIN_TIMEOUT_S = 2.0
+
+
+class TxQueue:
+    """Pending TX jobs keyed by topic, drained in arrival order by one worker.
+
+    A press for a topic that is still waiting replaces the queued job instead
+    of adding another burst, so flooding one button cannot build a backlog.
+    """
+
+    def __init__(self, maxsize: int = TX_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self._pending: "OrderedDict[str, Callable[[], None]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def put(self, key: str, job: Callable[[], None]) -> Optional[str]:
+        """Queue job for key without blocking. Returns "coalesced", "dropped" or None."""
+        with self._cond:
+            outcome = None
+            if key in self._pending:
+                outcome = "coalesced"
+            elif len(self._pending) >= self.maxsize:
+                self._pending.popitem(last=False)
+                outcome = "dropped"
+            self._pending[key] = job
+            self._cond.notify()
+            return outcome
+
+    def get(self) -> Optional[Callable[[], None]]:
+        """Block for the oldest pending job; None once closed and drained."""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            return self._pending.popitem(last=False)[1]
+
+    def close(self) -> None:
+        """Let the worker finish what's pending, then stop."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
 @dataclass
 class AppState:
     config: Dict[str, Any]
     topic_map: Dict[str, str]
     radio: Optional[Any]
+    # When set (by run()), TX jobs are handed to the worker thread instead of
+    # running on the MQTT network thread.
+    tx_queue: Optional[TxQueue] = None
 
 
 def _apply_rf_defaults(tx: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, Any]:
@@ -221,20 +344,33 @@ def _apply_rf_defaults(tx: Dict[str, Any], cfg: Dict[str, Any]) -> Dict[str, Any
 class TxScriptContext:
     """Helpers exposed to user *.py tx scripts."""
 
-    def __init__(self, *, radio: Any, cfg: Dict[str, Any], script_path: str):
+    def __init__(self, *, radio: Any, cfg: Dict[str, Any], script_path: str, timeout_s: Optional[float] = None):
         self.radio = radio
         self.config = cfg
         self.script_path = script_path
         self.script_dir = os.path.dirname(os.path.abspath(script_path))
+        self.timeout_s = timeout_s
+        self._deadline = time.monotonic() + timeout_s if timeout_s else None
+
+    def _check_deadline(self) -> None:
+        """Raise TimeoutError once the script has run past its timeout."""
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise TimeoutError(f"TX script timed out after {self.timeout_s}s")
 
     def log(self, msg: str) -> None:
         print(f"[Py] {msg}")
 
     def sleep(self, seconds: float) -> None:
-        time.sleep(float(seconds))
+        self._check_deadline()
+        seconds = float(seconds)
+        if self._deadline is not None and time.monotonic() + seconds > self._deadline:
+            time.sleep(max(0.0, self._deadline - time.monotonic()))
+            self._check_deadline()
+        time.sleep(seconds)
 
     def transmit(self, **tx: Any) -> None:
         """Low-level transmit helper (accepts rf.Radio.transmit kwargs)."""
+        self._check_deadline()
         if "freq" not in tx or "payload" not in tx:
             raise ValueError("transmit() requires freq=<hz> and payload=<bytes>")
         merged = _apply_rf_defaults(tx, self.config)
@@ -244,20 +380,19 @@ class TxScriptContext:
         s = (payload_hex or "").strip()
         if s.lower().startswith("0x"):
             s = s[2:]
-        s = re.sub(r"[^0-9a-fA-F]", "", s)
-        if len(s) % 2:
-            s = "0" + s
-        payload = bytes.fromhex(s)
+        h = s.encode("ascii", "ignore").translate(None, _NON_HEX_BYTES)
+        if len(h) % 2:
+            h = b"0" + h
+        payload = binascii.unhexlify(h)
         self.transmit(freq=int(freq_hz), payload=payload, **opts)
 
     def tx_b64(self, freq_hz: int, payload_b64: str, **opts: Any) -> None:
-        import base64
-
         payload = base64.b64decode((payload_b64 or "").encode("ascii"))
         self.transmit(freq=int(freq_hz), payload=payload, **opts)
 
     def tx_file(self, rel_or_abs_path: str, **overrides: Any) -> None:
         """Replay a .sub or .rfcat.json from within a script."""
+        self._check_deadline()
         p = rel_or_abs_path
         if not os.path.isabs(p):
             p = os.path.join(self.script_dir, p)
@@ -283,6 +418,10 @@ def _coerce_tx_list(obj: Any) -> Optional[list[dict]]:
 
 
 def _execute_python_tx_script(path: str, state: AppState) -> None:
+    # Only needed when a .py TX script actually runs; keep them off the startup path.
+    import runpy
+    import traceback
+
     files_cfg = state.config.get("files", {}) or {}
     allow = bool(files_cfg.get("allow_python_scripts", False))
     if not allow:
@@ -300,23 +439,16 @@ def _execute_python_tx_script(path: str, state: AppState) -> None:
     if timeout_s < 1:
         timeout_s = 1
 
-    ctx = TxScriptContext(radio=state.radio, cfg=state.config, script_path=path)
+    ctx = TxScriptContext(radio=state.radio, cfg=state.config, script_path=path, timeout_s=timeout_s)
 
     # Run in the script's folder so relative paths work.
     cwd = os.getcwd()
-    old_handler = None
-
-    def _timeout_handler(signum, frame):  # pragma: no cover
-        raise TimeoutError(f"TX script timed out after {timeout_s}s")
 
+    # The timeout is cooperative: ctx.sleep/transmit/tx_* raise TimeoutError once
+    # the deadline passes. Nothing interrupts the script mid-USB-transfer.
     try:
         os.chdir(ctx.script_dir)
 
-        # Best-effort timeout (Unix only).
-        if hasattr(signal, "SIGALRM"):
-            old_handler = signal.signal(signal.SIGALRM, _timeout_handler)
-            signal.alarm(timeout_s)
-
         # Load the script without executing __main__ blocks.
         env = runpy.run_path(
             path,
@@ -324,6 +456,8 @@ def _execute_python_tx_script(path: str, state: AppState) -> None:
             run_name="__tx_script__",
         )
 
+        ctx._check_deadline()
+
         # Convention 1: run(ctx) or main(ctx)
         fn = env.get("run") or env.get("main")
         if callable(fn):
@@ -337,6 +471,7 @@ def _execute_python_tx_script(path: str, state: AppState) -> None:
 
         if tx_list:
             for i, tx in enumerate(tx_list, start=1):
+                ctx._check_deadline()
                 merged = _apply_rf_defaults(tx, state.config)
                 print(f"[Py] TX {i}/{len(tx_list)}")
                 state.radio.transmit(**merged)
@@ -349,13 +484,6 @@ def _execute_python_tx_script(path: str, state: AppState) -> None:
         tb = traceback.format_exc()
         print(f"[Py] ERROR executing {os.path.basename(path)}: {e}\n{tb}")
     finally:
-        try:
-            if hasattr(signal, "SIGALRM"):
-                signal.alarm(0)
-                if old_handler is not None:
-                    signal.signal(signal.SIGALRM, old_handler)
-        except Exception:
-            pass
         try:
             os.chdir(cwd)
         except Exception:
@@ -387,9 +515,12 @@ def _on_connect_factory(state: AppState):
 
         print("[MQTT] Connected")
 
-        # Publish HA discovery + build topic->file map.
+        # Publish HA discovery + build topic->file map. Updated in place so
+        # on_message can hold a direct reference to the dict.
         try:
-            state.topic_map = run_discovery(client, state.config)
+            topic_map = run_discovery(client, state.config)
+            state.topic_map.clear()
+            state.topic_map.update(topic_map)
             print(f"[Files] Mapped {len(state.topic_map)} replay topics")
         except Exception as e:
             print(f"[Discovery] ERROR: {e}")
@@ -397,10 +528,42 @@ def _on_connect_factory(state: AppState):
     return on_connect
 
 
+def _submit_tx(state: AppState, topic: str, job: Callable[[], None]) -> None:
+    """Run a TX job on the worker thread (or inline when no worker is running)."""
+    if state.tx_queue is None:
+        job()
+        return
+    outcome = state.tx_queue.put(topic, job)
+    if outcome == "coalesced":
+        print(f"[MQTT] {topic} already queued; coalescing press")
+    elif outcome == "dropped":
+        print("[RfCat] WARNING: TX queue full; dropped oldest press")
+
+
+def _tx_worker(tx_queue: TxQueue) -> None:
+    """Single consumer so RF access stays serialized; returns once the queue is closed."""
+    while True:
+        job = tx_queue.get()
+        if job is None:
+            return
+        try:
+            job()
+        except Exception as e:
+            print(f"[RfCat] ERROR in TX worker: {e}")
+
+
+@lru_cache(maxsize=1024)
+def _describe_target(file_path: str) -> tuple[str, bool]:
+    """(basename, is_py) for a topic_map path; computed once per button, not per press."""
+    return os.path.basename(file_path), str(file_path).lower().endswith(".py")
+
+
 def _on_message_factory(state: AppState):
+    topic_map = state.topic_map  # identity is stable (see _on_connect_factory)
+
     def on_message(client, userdata, msg):
         topic = msg.topic
-        file_path = state.topic_map.get(topic)
+        file_path = topic_map.get(topic)
         if not file_path:
             return
 
@@ -418,9 +581,13 @@ def _on_message_factory(state: AppState):
         print(f"[MQTT] Trigger: {topic}")
 
         # Special case: execute user-provided TX scripts (optional).
-        if str(file_path).lower().endswith(".py"):
-            print(f"[Py] Running {os.path.basename(file_path)}")
-            _execute_python_tx_script(file_path, state)
+        name, is_py = _describe_target(file_path)
+        if is_py:
+            def job() -> None:
+                print(f"[Py] Running {name}")
+                _execute_python_tx_script(file_path, state)
+
+            _submit_tx(state, topic, job)
             return
 
         try:
@@ -433,19 +600,23 @@ def _on_message_factory(state: AppState):
             print("[RfCat] ERROR: RF device not initialized")
             return
 
-        try:
-            print(f"[RfCat] Replaying {os.path.basename(file_path)}")
-            merged = _apply_rf_defaults(tx, state.config)
-            state.radio.transmit(**merged)
-            print("[RfCat] Transmission complete")
-        except Exception as e:
-            print(f"[RfCat] ERROR during transmission: {e}")
+        def job() -> None:
+            try:
+                print(f"[RfCat] Replaying {name}")
+                merged = _apply_rf_defaults(tx, state.config)
+                state.radio.transmit(**merged)
+                print("[RfCat] Transmission complete")
+            except Exception as e:
+                print(f"[RfCat] ERROR during transmission: {e}")
+
+        _submit_tx(state, topic, job)
 
     return on_message
 
 
 def run() -> None:
-    # Force basic color support in typical docker/HA logs.
+    # Force basic color support in typical docker/HA logs (the HA log viewer
+    # renders ANSI). Set NO_COLOR or CLICOLOR_FORCE=0 for plain output.
     os.environ.setdefault("TERM", "xterm-256color")
     os.environ.setdefault("CLICOLOR_FORCE", "1")
     install_pretty_print()
@@ -481,6 +652,11 @@ def run() -> None:
         print("[Config] CRITICAL: mqtt.broker is missing")
         raise SystemExit(1)
 
+    # Transmit off the MQTT network thread so keepalives aren't blocked by RFxmit.
+    state.tx_queue = TxQueue(TX_QUEUE_SIZE)
+    worker = threading.Thread(target=_tx_worker, args=(state.tx_queue,), name="catflap-tx", daemon=True)
+    worker.start()
+
     try:
         print(f"[MQTT] Connecting to {broker}:{port} ...")
         client.connect(broker, port, 60)
@@ -496,9 +672,13 @@ def run() -> None:
             client.disconnect()
         except Exception:
             pass
+        # Pending presses still go out; give them a moment, then leave the
+        # daemon thread to exit with the process.
+        state.tx_queue.close()
+        worker.join(TX_WORKER_JOIN_TIMEOUT_S)
 
 
 if __name__ == "__main__":
+    # run() sets up the terminal env and pretty print; the logo stays unprefixed.
     show_logo(get_version())
-    install_pretty_print()
     run()
@@ -1,7 +1,9 @@
 import base64
+import binascii
 import json
 import os
 import re
+from functools import lru_cache
 
 #
 # Parsers for supported TX file formats.
@@ -22,6 +24,11 @@ SUPPORTED_EXTENSIONS = (
     ".rfcat.json",
 )
 
+# Bytes pattern: .sub files are scanned undecoded (int() accepts ASCII bytes).
+_INT_RE = re.compile(rb"-?\d+")
+# Every byte that is not a hex digit, for bytes.translate(None, _NON_HEX_BYTES).
+_NON_HEX_BYTES = bytes(c for c in range(256) if chr(c) not in "0123456789abcdefABCDEF")
+
 
 def _strip_known_suffix(filename: str) -> str:
     """Return a stable stem for entity IDs (handles double extensions)."""
@@ -32,7 +39,9 @@ def _strip_known_suffix(filename: str) -> str:
     return os.path.splitext(fn)[0]
 
 
+@lru_cache(maxsize=1024)
 def is_supported_path(path: str) -> bool:
+    # Paths come from the fixed topic_map, so each one is checked once.
     p = path.lower()
     return p.endswith(SUPPORTED_EXTENSIONS)
 
@@ -41,19 +50,32 @@ def is_supported_path(path: str) -> bool:
 # Flipper .sub (RAW_Data)
 # -----------------------------
 
+def _file_version(path: str):
+    """(mtime_ns, size) of path; part of the tx-request cache key so edits are picked up."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
 def _read_flipper_sub(path: str):
     freq = None
     raw_lines = []
 
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith("Frequency:"):
-                freq = int(line.split(":", 1)[1].strip())
-            elif line.startswith("RAW_Data:"):
-                nums = [int(x) for x in re.findall(r"-?\d+", line[len("RAW_Data:"):])]
-                if nums:
-                    raw_lines.append(nums)
+    with open(path, "rb") as f:
+        data = f.read()
+
+    for line in data.splitlines():
+        line = line.strip()
+        if line.startswith(b"Frequency:"):
+            freq = int(line[len(b"Frequency:"):])
+        elif line.startswith(b"RAW_Data:"):
+            body = line[len(b"RAW_Data:"):]
+            try:
+                # Common case: whitespace-separated ints, parsed by C-level split/int.
+                nums = list(map(int, body.split()))
+            except ValueError:
+                nums = [int(x) for x in _INT_RE.findall(body)]
+            if nums:
+                raw_lines.append(nums)
 
     if freq is None:
         raise ValueError("No Frequency found")
@@ -62,40 +84,49 @@ def _read_flipper_sub(path: str):
     return freq, raw_lines
 
 
-def _durations_to_bits(durs, drate, invert_level=False, max_gap_us=30000):
-    """Convert +/- duration microseconds into a chip-level 0/1 stream."""
-    bits = []
-    for v in durs:
-        level = 1 if v > 0 else 0
-        if invert_level:
-            level ^= 1
+# One-byte runs repeated per chip (bytes * n is a C-level fill).
+_LEVEL_BYTES = (b"\x00", b"\x01")
+
 
-        dur_us = abs(v)
+def _durations_to_bits(durs, drate, invert_level=False, max_gap_us=30000) -> bytearray:
+    """Convert +/- duration microseconds into a chip-level 0/1 stream (one byte per chip)."""
+    bits = bytearray()
+    # Fold invert_level into the fill table so the loop has no extra branch.
+    fill = _LEVEL_BYTES[::-1] if invert_level else _LEVEL_BYTES
+    for v in durs:
+        if v > 0:
+            level, dur_us = 1, v
+        else:
+            level, dur_us = 0, -v
         if dur_us > max_gap_us:
             dur_us = max_gap_us
 
-        chips = int(round(dur_us * drate / 1_000_000.0))
-        if chips < 1:
-            chips = 1
-        bits.extend([level] * chips)
+        # Keep "* drate / 1e6" un-hoisted: a precomputed drate/1e6 factor rounds
+        # differently on exact .5 chip boundaries. round(float) is already an int.
+        chips = round(dur_us * drate / 1_000_000.0)
+        bits += fill[level] * (chips if chips > 0 else 1)
     return bits
 
 
+# 0/1 chip bytes -> ASCII "0"/"1" (for int(..., 2)), and per-byte bit reversal.
+_BIT_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+_REVERSE_BITS = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
 def _pack_bits(bits, msb_first=True) -> bytes:
-    rem = len(bits) % 8
+    """Pack a 0/1 chip stream into bytes, zero-padding the last byte."""
+    chips = bytes(bits)
+    rem = len(chips) % 8
     if rem:
-        bits = bits + [0] * (8 - rem)
+        chips += bytes(8 - rem)
+    if not chips:
+        return b""
 
-    out = bytearray()
-    for i in range(0, len(bits), 8):
-        b = bits[i:i + 8]
-        if not msb_first:
-            b = list(reversed(b))
-        val = 0
-        for bit in b:
-            val = (val << 1) | bit
-        out.append(val)
-    return bytes(out)
+    # Base-2 int parsing and to_bytes() do the packing in C.
+    out = int(chips.translate(_BIT_ASCII), 2).to_bytes(len(chips) // 8, "big")
+    if not msb_first:
+        out = out.translate(_REVERSE_BITS)
+    return out
 
 
 def parse_flipper_sub(
@@ -125,13 +156,13 @@ def parse_flipper_sub(
 # -----------------------------
 
 def _hex_to_bytes(s: str) -> bytes:
-    s = s.strip().lower()
-    if s.startswith("0x"):
+    s = s.strip()
+    if s[:2].lower() == "0x":
         s = s[2:]
-    s = re.sub(r"[^0-9a-f]", "", s)
-    if len(s) % 2:
-        s = "0" + s
-    return bytes.fromhex(s)
+    h = s.encode("ascii", "ignore").translate(None, _NON_HEX_BYTES)
+    if len(h) % 2:
+        h = b"0" + h
+    return binascii.unhexlify(h)
 
 
 def _load_rfcat_json(path: str) -> dict:
@@ -213,7 +244,19 @@ def parse_rfcat_json(path: str):
 # -----------------------------
 
 def get_tx_request(path: str, default_repeat: int = 20, default_drate: int = 3333) -> dict:
-    """Auto-detect format and return a dict for rf.Radio.transmit()."""
+    """Auto-detect format and return a dict for rf.Radio.transmit().
+
+    The built request is cached per file version (mtime + size); callers get
+    a fresh shallow copy they are free to update.
+    """
+    if not is_supported_path(path):
+        raise ValueError(f"Unsupported file type for replay: {os.path.basename(path)}")
+    tx = _get_tx_request_cached(path, *_file_version(path), default_repeat, default_drate)
+    return dict(tx)
+
+
+@lru_cache(maxsize=64)
+def _get_tx_request_cached(path: str, mtime_ns: int, size: int, default_repeat: int, default_drate: int) -> dict:
     p = path.lower()
     if p.endswith(".sub"):
         freq, payload, opts = parse_flipper_sub(path, drate=default_drate)
@@ -228,7 +271,4 @@ def get_tx_request(path: str, default_repeat: int = 20, default_drate: int = 333
             "syncmode": 0,
             "preamble": 0,
         }
-    if p.endswith(".rfcat.json"):
-        return parse_rfcat_json(path)
-
-    raise ValueError(f"Unsupported file type for replay: {os.path.basename(path)}")
+    return parse_rfcat_json(path)
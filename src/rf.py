@@ -1,5 +1,7 @@
 import logging
-from typing import Optional, Any
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Optional, Any, Sequence
 
 logger = logging.getLogger("RFDriver")
 
@@ -8,9 +10,19 @@ try:
 except Exception:  # pragma: no cover
     rflib = None
 
+# Accepted modulation names -> (rflib modem constant, is_ask), resolved once at import.
+_MOD_MAP: dict[str, tuple[int, bool]] = {}
+_MANCHESTER = 0
+if rflib is not None:
+    _MOD_MAP.update(dict.fromkeys(("ASK_OOK", "OOK", "ASK"), (rflib.MOD_ASK_OOK, True)))
+    _MOD_MAP.update(dict.fromkeys(("2FSK", "FSK"), (rflib.MOD_2FSK, False)))
+    _MANCHESTER = getattr(rflib, "MANCHESTER", 0)
+
 # CC1110Fx / CC1111Fx XDATA addresses (SWRS033H)
 FREND0_ADDR = 0xDF1B      # FREND0 - Front End TX Configuration
 PA_TABLE0_ADDR = 0xDF2E   # PA_TABLE0..7: 0xDF2E down to 0xDF27
+# FREND0..PA_TABLE0 is one contiguous XDATA span (FSCAL/TEST regs in between).
+_POWER_SPAN_LEN = PA_TABLE0_ADDR - FREND0_ADDR + 1
 
 # Human-friendly TX power lookup table (target dBm -> PATABLE value),
 # derived from TI recommended settings by band.
@@ -26,28 +38,60 @@ POWER_TABLE = {
     915: {-30: 0x03, -20: 0x0D, -15: 0x1D, -10: 0x26, -5: 0x57, 0: 0x8E, 5: 0x83, 7: 0xC7, 10: 0xC0},
 }
 
-VALID_DBM = sorted({k for band in POWER_TABLE.values() for k in band.keys()})
+VALID_DBM = tuple(sorted({k for band in POWER_TABLE.values() for k in band}))
+
+# Smart-mode register plans: (band, dBm, is_ask) -> (PA_POWER, PA_TABLE0.. values).
+# ASK/OOK keeps PA_TABLE0 off for the '0' level and sends '1' from index 1;
+# other modulations transmit from index 0.
+_SMART_PLANS = {
+    (band, dbm, is_ask): (1, (0x00, code)) if is_ask else (0, (code,))
+    for band, codes in POWER_TABLE.items()
+    for dbm, code in codes.items()
+    for is_ask in (True, False)
+}
+
+# tx_power_mode spellings -> canonical mode (one dict probe per transmit).
+_POWER_MODES = {
+    **dict.fromkeys(("max", "maximum", "full"), "max"),
+    **dict.fromkeys(("default", "auto", "keep", "none"), "default"),
+    **dict.fromkeys(("smart", "preset", "table"), "smart"),
+    **dict.fromkeys(("manual", "register", "frend0"), "manual"),
+}
 
 
 def _parse_int(value: Any) -> Optional[int]:
     """Parse an int that may be: int, '123', '0x7f', or None."""
-    if value is None:
-        return None
-    if isinstance(value, bool):
-        return int(value)
+    parse = _PARSE_INT_DISPATCH.get(type(value))
+    if parse is not None:
+        return parse(value)
+    # Subclasses (IntEnum, str-derived config types) take the slow path.
     if isinstance(value, int):
         return int(value)
     if isinstance(value, str):
-        s = value.strip()
-        if not s:
-            return None
-        try:
-            return int(s, 0)
-        except ValueError:
-            return None
+        return _parse_int_str(value)
     return None
 
 
+# Config strings repeat on every transmit; cache their parse.
+@lru_cache(maxsize=256)
+def _parse_int_str(value: str) -> Optional[int]:
+    s = value.strip()
+    if not s:
+        return None
+    try:
+        return int(s, 0)
+    except ValueError:
+        return None
+
+
+_PARSE_INT_DISPATCH = {
+    type(None): lambda value: None,
+    int: int,
+    bool: int,
+    str: _parse_int_str,
+}
+
+
 def _parse_patable(value: Any) -> Optional[list[int]]:
     """Parse PATABLE config.
 
@@ -63,21 +107,15 @@ def _parse_patable(value: Any) -> Optional[list[int]]:
         return [value & 0xFF]
 
     if isinstance(value, str):
-        s = value.strip()
-        if not s:
-            return None
-        if "," in s:
-            out: list[int] = []
-            for part in [p.strip() for p in s.split(",") if p.strip()]:
-                v = _parse_int(part)
-                if v is None:
-                    return None
-                out.append(v & 0xFF)
-            return out or None
-        v = _parse_int(s)
-        return [v & 0xFF] if v is not None else None
+        parsed = _parse_patable_str(value)
+        return list(parsed) if parsed is not None else None
 
     if isinstance(value, list):
+        # All-int, in-range lists (the usual config) convert in one C call.
+        try:
+            return list(bytes(value)) or None
+        except (TypeError, ValueError):
+            pass
         out: list[int] = []
         for item in value:
             v = _parse_int(item)
@@ -89,16 +127,61 @@ def _parse_patable(value: Any) -> Optional[list[int]]:
     return None
 
 
+@lru_cache(maxsize=64)
+def _parse_patable_str(value: str) -> Optional[tuple[int, ...]]:
+    """String form of _parse_patable; a tuple so the cached result can't be mutated."""
+    s = value.strip()
+    if not s:
+        return None
+    if "," in s:
+        # int(p, 0) already ignores surrounding whitespace; any bad entry -> None.
+        try:
+            out = tuple(int(p, 0) & 0xFF for p in s.split(",") if p and not p.isspace())
+        except ValueError:
+            return None
+        return out or None
+    v = _parse_int_str(s)
+    return (v & 0xFF,) if v is not None else None
+
+
+_FREND0_PA_POWER_MASK = 0b111
+_FREND0_LODIV_MASK = 0b11 << 4
+
+
+def _frend0_value(cur_val: int, pa_power: int, lodiv_buf_current_tx: Optional[int]) -> int:
+    """FREND0 with PA_POWER [2:0] and, if given, LODIV_BUF_CURRENT_TX [5:4] replaced."""
+    mask, bits = _FREND0_PA_POWER_MASK, pa_power
+
+    if lodiv_buf_current_tx is not None:
+        if not (0 <= lodiv_buf_current_tx <= 3):
+            raise ValueError("frend0_lodiv_buf_current_tx must be 0..3")
+        mask |= _FREND0_LODIV_MASK
+        bits |= lodiv_buf_current_tx << 4
+
+    if not (0 <= pa_power <= 7):
+        raise ValueError("frend0_pa_power must be 0..7")
+    return (cur_val & ~mask) | bits
+
+
+def _is_ask(modulation: Any) -> bool:
+    """ASK/OOK use PATABLE[0] as the '0' level; everything else transmits from index 0."""
+    mod = str(modulation).upper()
+    return mod.startswith("ASK") or mod == "OOK"
+
+
+# Band bucket upper edges (exclusive) and the band each bucket maps to.
+_BAND_EDGES = (380_000_000, 600_000_000, 900_000_000)
+_BAND_VALUES = (315, 433, 868, 915)
+
+
 def _infer_band(freq_hz: int) -> int:
     """Infer which datasheet band bucket to use based on TX frequency."""
     # crude but effective bucket selection
-    if freq_hz < 380_000_000:
-        return 315
-    if freq_hz < 600_000_000:
-        return 433
-    if freq_hz < 900_000_000:
-        return 868
-    return 915
+    return _BAND_VALUES[bisect_right(_BAND_EDGES, freq_hz)]
+
+
+_AUTO_BANDS = frozenset({"", "auto"})
+_VALID_BANDS = frozenset(_BAND_VALUES)
 
 
 def _select_band(freq_hz: int, override: Any) -> int:
@@ -106,22 +189,23 @@ def _select_band(freq_hz: int, override: Any) -> int:
         return _infer_band(freq_hz)
     if isinstance(override, str):
         s = override.strip().lower()
-        if not s or s == "auto":
+        if s in _AUTO_BANDS:
             return _infer_band(freq_hz)
-        ov = _parse_int(s)
-        if ov in (315, 433, 868, 915):
-            return int(ov)
+        ov = _parse_int_str(s)
+        if ov in _VALID_BANDS:
+            return ov
         return _infer_band(freq_hz)
-    if isinstance(override, int) and override in (315, 433, 868, 915):
+    if isinstance(override, int) and override in _VALID_BANDS:
         return int(override)
     return _infer_band(freq_hz)
 
 
-def _lookup_power_code(band: int, target_dbm: int) -> Optional[int]:
-    band_map = POWER_TABLE.get(band)
-    if not band_map:
-        return None
-    return band_map.get(int(target_dbm))
+# poke() payload encodings, in probe order (rflib builds differ).
+_POKE_FORMS = (
+    list,                                # most portable
+    bytes,                               # ideal if supported
+    lambda data: data.decode("latin-1"),  # Python 2 "byte string"
+)
 
 
 class Radio:
@@ -136,9 +220,30 @@ class Radio:
             self.d.setModeIDLE()
             logger.info("RF Device Initialized")
         except Exception as e:
-            logger.critical(f"Could not initialize RF device: {e}")
+            logger.critical("Could not initialize RF device: %s", e)
             raise
 
+        # Last value written through each modem/power setter. Every setter is a
+        # USB control transfer, so transmit() skips the ones that wouldn't change.
+        self._applied: dict[str, Any] = {}
+
+        # XDATA accessors, resolved once (None when the firmware lacks them).
+        self._peek = getattr(self.d, "peek", None)
+        self._poke = getattr(self.d, "poke", None)
+        self._poke_form: Optional[int] = None  # index into _POKE_FORMS once known
+        # Optional rflib helpers (vary by rflib/firmware build), also resolved once.
+        self._setMaxPower = getattr(self.d, "setMaxPower", None)
+        self._setMdmManchester = getattr(self.d, "setMdmManchester", None)
+        self._setPower = getattr(self.d, "setPower", None)
+        self._setTxPower = getattr(self.d, "setTxPower", None)
+
+    def _changed(self, key: str, value: Any) -> bool:
+        """Record value for key; False if the dongle already has it."""
+        if key in self._applied and self._applied[key] == value:
+            return False
+        self._applied[key] = value
+        return True
+
     # ---------------------------------------------------------------------
     # Optional XDATA access (peek/poke). Used for deterministic FREND0/PATABLE.
     # ---------------------------------------------------------------------
@@ -150,11 +255,11 @@ class Radio:
           - list/tuple of ints
           - a latin-1 `str` (Python 2 "byte string")
         """
-        if not hasattr(self.d, "peek"):
+        if self._peek is None:
             return None
 
         try:
-            raw = self.d.peek(addr, size)
+            raw = self._peek(addr, size)
         except Exception:
             return None
 
@@ -177,52 +282,56 @@ class Radio:
           - bytes/bytearray
           - list[int]
           - a latin-1 `str` (Python 2 "byte string")
+
+        The first encoding that works is remembered and used directly from then on.
         """
-        if not hasattr(self.d, "poke"):
+        if self._poke is None:
             return False
 
-        candidates = [
-            list(data),  # most portable
-            data,        # ideal if supported
-        ]
-        try:
-            candidates.append(data.decode("latin-1", errors="ignore"))
-        except Exception:
-            pass
-
-        for payload in candidates:
+        if self._poke_form is not None:
             try:
-                self.d.poke(addr, payload)
+                self._poke(addr, _POKE_FORMS[self._poke_form](data))
                 return True
-            except TypeError:
-                continue
+            except Exception:
+                self._poke_form = None  # re-probe below
+
+        for form, encode in enumerate(_POKE_FORMS):
+            try:
+                self._poke(addr, encode(data))
             except Exception:
                 continue
+            self._poke_form = form
+            return True
 
         return False
 
     def _dump_power_regs(self, prefix: str = "") -> None:
         """Log FREND0 + PA_TABLE0..PA_TABLE7 (best-effort)."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         try:
-            fr = self._xdata_read(FREND0_ADDR, 1)
-            frend0 = fr[0] if fr else None
-
-            pt: list[Optional[int]] = []
-            for i in range(8):
-                b = self._xdata_read(PA_TABLE0_ADDR - i, 1)
-                pt.append(b[0] if b else None)
+            # One span peek covers FREND0 and all of PATABLE; fall back to single reads.
+            span = self._xdata_read(FREND0_ADDR, _POWER_SPAN_LEN)
+            if span is not None and len(span) == _POWER_SPAN_LEN:
+                frend0: Optional[int] = span[0]
+                pt: list[Optional[int]] = list(span[:-9:-1])
+            else:
+                fr = self._xdata_read(FREND0_ADDR, 1)
+                frend0 = fr[0] if fr else None
+                pt = []
+                for i in range(8):
+                    b = self._xdata_read(PA_TABLE0_ADDR - i, 1)
+                    pt.append(b[0] if b else None)
 
             def hx(v: Optional[int]) -> str:
                 return f"0x{v:02X}" if isinstance(v, int) else "None"
 
             logger.info(
-                f"{prefix}Power regs: FREND0={hx(frend0)} PA_TABLE0..7=["
-                + ", ".join(hx(v) for v in pt)
-                + "]"
+                "%sPower regs: FREND0=%s PA_TABLE0..7=[%s]",
+                prefix, hx(frend0), ", ".join(hx(v) for v in pt),
             )
         except Exception as e:
-            logger.debug(f"Power regs dump failed: {e}")
-
+            logger.debug("Power regs dump failed: %s", e)
 
     def _write_patable_index(self, index: int, value: int) -> None:
         if index < 0 or index > 7:
@@ -232,30 +341,69 @@ class Radio:
         if not ok:
             raise RuntimeError("Unable to write PATABLE (poke() not available or failed)")
 
+    def _write_patable(self, values: Sequence[int]) -> None:
+        """Write PA_TABLE0..PA_TABLE(n-1) in one poke.
+
+        PATABLE is laid out descending in XDATA, so the block starts at
+        PA_TABLE(n-1) and holds the values in reverse. Falls back to one
+        poke per index if the firmware rejects the multi-byte write.
+        """
+        n = len(values)
+        if n < 1 or n > 8:
+            raise ValueError("PATABLE write must cover 1..8 entries")
+        block = bytes(v & 0xFF for v in reversed(values))
+        if self._xdata_write(PA_TABLE0_ADDR - (n - 1), block):
+            return
+        for idx, v in enumerate(values):
+            self._write_patable_index(idx, v)
+
     def _set_frend0(self, pa_power: int, lodiv_buf_current_tx: Optional[int]) -> None:
         cur = self._xdata_read(FREND0_ADDR, 1)
         if cur is None:
             raise RuntimeError("FREND0 update requires firmware with peek()/poke() support")
 
         cur_val = cur[0]
-        new_val = cur_val
-
-        if lodiv_buf_current_tx is not None:
-            if not (0 <= lodiv_buf_current_tx <= 3):
-                raise ValueError("frend0_lodiv_buf_current_tx must be 0..3")
-            new_val = (new_val & ~(0b11 << 4)) | ((lodiv_buf_current_tx & 0b11) << 4)
-
-        if not (0 <= pa_power <= 7):
-            raise ValueError("frend0_pa_power must be 0..7")
-        new_val = (new_val & ~0b111) | (pa_power & 0b111)
+        new_val = _frend0_value(cur_val, pa_power, lodiv_buf_current_tx)
 
         if new_val != cur_val:
             if not self._xdata_write(FREND0_ADDR, bytes([new_val])):
                 raise RuntimeError("Unable to write FREND0 (poke() failed)")
 
+    def _program_power_regs(
+        self,
+        pa_power: int,
+        lodiv_buf_current_tx: Optional[int],
+        patable: Optional[Sequence[int]] = None,
+    ) -> None:
+        """Set FREND0 and optionally PA_TABLE0..n-1, reading both with one peek.
+
+        One read of the FREND0..PA_TABLE0 span gives the current value of every
+        register we may change, so unchanged ones are not written at all. Only
+        FREND0 and the PATABLE block are ever poked; the FSCAL/TEST registers
+        in between are left alone. Falls back to separate reads if the
+        firmware returns a short span.
+        """
+        span = self._xdata_read(FREND0_ADDR, _POWER_SPAN_LEN)
+        if span is None or len(span) != _POWER_SPAN_LEN:
+            self._set_frend0(pa_power=pa_power, lodiv_buf_current_tx=lodiv_buf_current_tx)
+            if patable is not None:
+                self._write_patable(patable)
+            return
+
+        new_frend0 = _frend0_value(span[0], pa_power, lodiv_buf_current_tx)
+        if new_frend0 != span[0]:
+            if not self._xdata_write(FREND0_ADDR, bytes([new_frend0])):
+                raise RuntimeError("Unable to write FREND0 (poke() failed)")
+
+        if patable is not None:
+            n = len(patable)
+            start = PA_TABLE0_ADDR - (n - 1) - FREND0_ADDR
+            if n > 8 or span[start:start + n] != bytes(v & 0xFF for v in reversed(patable)):
+                self._write_patable(patable)
+
     def _apply_manual_regs(
         self,
-        modulation: str,
+        is_ask: bool,
         frend0_pa_power: Any,
         frend0_lodiv_buf_current_tx: Any,
         patable: Any,
@@ -269,43 +417,32 @@ class Radio:
             # sensible default for ASK/OOK: index 0 is off, index 1 is on
             pa_power = 1
 
-        self._set_frend0(pa_power=pa_power, lodiv_buf_current_tx=lo_div)
-
         if pt is None:
+            self._program_power_regs(pa_power=pa_power, lodiv_buf_current_tx=lo_div)
             logger.warning("manual power mode selected but 'patable' not provided; leaving PATABLE unchanged")
             return
 
-        is_ask = str(modulation).upper() in ("ASK_OOK", "ASK", "OOK") or str(modulation).upper().startswith("ASK")
-
         # Single value -> treat as ON level; fill indices up to PA_POWER
         if len(pt) == 1:
             on_val = pt[0] & 0xFF
 
             if is_ask:
                 # In ASK/OOK, index 0 is used for '0' level -> ensure it's off.
-                self._write_patable_index(0, 0x00)
-                start = 1
+                values = [0x00] + [on_val] * pa_power
             else:
-                start = 0
-
-            for idx in range(start, pa_power + 1):
-                self._write_patable_index(idx, on_val)
-
-            self._dump_power_regs(prefix="Manual power applied: ") 
-            return
-
-        if len(pt) > 8:
+                values = [on_val] * (pa_power + 1)
+        elif len(pt) > 8:
             raise ValueError("patable list may have at most 8 entries (PA_TABLE0..PA_TABLE7)")
+        else:
+            values = pt
 
-        for idx, v in enumerate(pt):
-            self._write_patable_index(idx, v & 0xFF)
-            
+        self._program_power_regs(pa_power=pa_power, lodiv_buf_current_tx=lo_div, patable=values)
         self._dump_power_regs(prefix="Manual power applied: ")
 
     def _apply_smart_power(
         self,
         freq_hz: int,
-        modulation: str,
+        is_ask: bool,
         target_dbm: Any,
         band_override: Any,
         lodiv_buf_current_tx: Any,
@@ -316,50 +453,44 @@ class Radio:
             t_dbm = 0
 
         band = _select_band(freq_hz, band_override)
-        code = _lookup_power_code(band, t_dbm)
+        plan = _SMART_PLANS.get((band, t_dbm, is_ask))
 
-        if code is None:
+        if plan is None:
             logger.warning(
-                f"Smart power: no table entry for band={band} target_dbm={t_dbm}. "
-                f"Valid dBm values: {VALID_DBM}. Falling back to max power."
+                "Smart power: no table entry for band=%s target_dbm=%s. "
+                "Valid dBm values: %s. Falling back to max power.",
+                band, t_dbm, VALID_DBM,
             )
-            if hasattr(self.d, "setMaxPower"):
-                self.d.setMaxPower()
+            if self._setMaxPower:
+                self._setMaxPower()
             return
 
-        # Prefer deterministic regs if firmware supports it; otherwise fall back to rflib helper.
-        can_regs = hasattr(self.d, "peek") and hasattr(self.d, "poke")
+        pa_power, patable = plan
+        code = patable[-1]
 
-        is_ask = str(modulation).upper() in ("ASK_OOK", "ASK", "OOK") or str(modulation).upper().startswith("ASK")
+        # Prefer deterministic regs if firmware supports it; otherwise fall back to rflib helper.
+        can_regs = self._peek is not None and self._poke is not None
 
         if can_regs:
             try:
                 lo_div = _parse_int(lodiv_buf_current_tx)
-                if is_ask:
-                    # index 0 = off, index 1 = on
-                    self._set_frend0(pa_power=1, lodiv_buf_current_tx=lo_div)
-                    self._write_patable_index(0, 0x00)
-                    self._write_patable_index(1, code & 0xFF)
-                else:
-                    # FSK/etc: use index 0 directly
-                    self._set_frend0(pa_power=0, lodiv_buf_current_tx=lo_div)
-                    self._write_patable_index(0, code & 0xFF)
-                logger.info(f"Smart power applied: band={band} target={t_dbm}dBm patable=0x{code:02X}")
+                self._program_power_regs(pa_power=pa_power, lodiv_buf_current_tx=lo_div, patable=patable)
+                logger.info("Smart power applied: band=%s target=%sdBm patable=0x%02X", band, t_dbm, code)
                 return
             except Exception as e:
-                logger.warning(f"Smart power regs path failed ({e}); falling back to setPower")
+                logger.warning("Smart power regs path failed (%s); falling back to setPower", e)
 
         # Fallback: setPower expects a PATABLE code (exact semantics vary by firmware).
-        if hasattr(self.d, "setPower"):
-            self.d.setPower(int(code))
-            logger.info(f"Smart power applied via setPower: band={band} target={t_dbm}dBm code=0x{code:02X}")
-        elif hasattr(self.d, "setTxPower"):
-            self.d.setTxPower(int(code))
-            logger.info(f"Smart power applied via setTxPower: band={band} target={t_dbm}dBm code=0x{code:02X}")
+        if self._setPower:
+            self._setPower(int(code))
+            logger.info("Smart power applied via setPower: band=%s target=%sdBm code=0x%02X", band, t_dbm, code)
+        elif self._setTxPower:
+            self._setTxPower(int(code))
+            logger.info("Smart power applied via setTxPower: band=%s target=%sdBm code=0x%02X", band, t_dbm, code)
         else:
             logger.warning("Smart power requested but no setPower/setTxPower available; falling back to max power")
-            if hasattr(self.d, "setMaxPower"):
-                self.d.setMaxPower()
+            if self._setMaxPower:
+                self._setMaxPower()
 
     def _apply_power_settings(
         self,
@@ -371,30 +502,34 @@ class Radio:
         frend0_pa_power: Any,
         frend0_lodiv_buf_current_tx: Any,
         patable: Any,
+        is_ask: Optional[bool] = None,
     ) -> None:
-        mode = (tx_power_mode or "smart").strip().lower()
-
-        if mode in ("max", "maximum", "full"):
-            if hasattr(self.d, "setMaxPower"):
-                self.d.setMaxPower()
+        """Apply tx_power_mode; transmit() passes is_ask from _MOD_MAP, other callers may omit it."""
+        mode = _POWER_MODES.get((tx_power_mode or "smart").strip().lower())
+        if mode == "default":
             return
 
-        if mode in ("default", "auto", "keep", "none"):
+        if mode == "max":
+            if self._setMaxPower:
+                self._setMaxPower()
             return
 
-        if mode in ("smart", "preset", "table"):
+        if is_ask is None:
+            is_ask = _is_ask(modulation)
+
+        if mode == "smart":
             self._apply_smart_power(
                 freq_hz=freq_hz,
-                modulation=modulation,
+                is_ask=is_ask,
                 target_dbm=tx_power_target_dbm,
                 band_override=tx_power_band,
                 lodiv_buf_current_tx=frend0_lodiv_buf_current_tx,
             )
             return
 
-        if mode in ("manual", "register", "frend0"):
+        if mode == "manual":
             self._apply_manual_regs(
-                modulation=modulation,
+                is_ask=is_ask,
                 frend0_pa_power=frend0_pa_power,
                 frend0_lodiv_buf_current_tx=frend0_lodiv_buf_current_tx,
                 patable=patable,
@@ -428,38 +563,40 @@ class Radio:
         frend0_lodiv_buf_current_tx: Any = None,
         patable: Any = None,
     ) -> None:
-        if rflib is None:
-            raise ImportError("rflib is not available (RfCat not installed)")
-
+        # No rflib check here: __init__ refuses to build a Radio without it, and
+        # the modem constants were bound at import (_MOD_MAP/_MANCHESTER).
         try:
-            self.d.setFreq(int(freq))
+            if self._changed("freq", int(freq)):
+                self.d.setFreq(int(freq))
 
             mod = str(modulation).upper()
-            if mod in ("ASK_OOK", "OOK", "ASK"):
-                mdm = rflib.MOD_ASK_OOK
-            elif mod in ("2FSK", "FSK"):
-                mdm = rflib.MOD_2FSK
-            else:
-                raise ValueError(f"Unknown modulation: {modulation}")
-
-            if manchester and hasattr(rflib, "MANCHESTER"):
-                mdm |= rflib.MANCHESTER
-
-            self.d.setMdmModulation(mdm)
-            self.d.setMdmDRate(int(drate))
-            self.d.setMdmSyncMode(int(syncmode))
-            self.d.setMdmNumPreamble(int(preamble))
-
-            if hasattr(self.d, "setMdmManchester"):
-                self.d.setMdmManchester(1 if manchester else 0)
-
-            if deviation is not None and mod in ("2FSK", "FSK"):
+            try:
+                mdm, is_ask = _MOD_MAP[mod]
+            except KeyError:
+                raise ValueError(f"Unknown modulation: {modulation}") from None
+
+            if manchester:
+                mdm |= _MANCHESTER
+
+            if self._changed("modulation", mdm):
+                self.d.setMdmModulation(mdm)
+            if self._changed("drate", int(drate)):
+                self.d.setMdmDRate(int(drate))
+            if self._changed("syncmode", int(syncmode)):
+                self.d.setMdmSyncMode(int(syncmode))
+            if self._changed("preamble", int(preamble)):
+                self.d.setMdmNumPreamble(int(preamble))
+
+            if self._setMdmManchester and self._changed("manchester", bool(manchester)):
+                self._setMdmManchester(1 if manchester else 0)
+
+            if deviation is not None and not is_ask and self._changed("deviation", int(deviation)):
                 self.d.setMdmDeviatn(int(deviation))
 
             # Apply power AFTER modem config and AFTER setFreq (band matters)
             if max_power:
                 tx_power_mode = "max"
-            self._apply_power_settings(
+            power = dict(
                 freq_hz=int(freq),
                 modulation=mod,
                 tx_power_mode=tx_power_mode,
@@ -468,14 +605,21 @@ class Radio:
                 frend0_pa_power=frend0_pa_power,
                 frend0_lodiv_buf_current_tx=frend0_lodiv_buf_current_tx,
                 patable=patable,
+                is_ask=is_ask,
             )
+            if self._changed("power", power):
+                self._apply_power_settings(**power)
 
             self.d.makePktFLEN(len(payload))
-            logger.info(f"TX {len(payload)} bytes @ {freq}Hz")
-            self.d.RFxmit(bytes(payload), repeat=int(repeat))
+            logger.info("TX %d bytes @ %sHz", len(payload), freq)
+            # Payloads from payload.py are already bytes; only copy other buffers.
+            buf = payload if isinstance(payload, bytes) else bytes(payload)
+            self.d.RFxmit(buf, repeat=int(repeat))
 
         except Exception as e:
-            logger.error(f"Transmission failed: {e}")
+            # Unknown dongle state after a failure: re-apply everything next time.
+            self._applied.clear()
+            logger.error("Transmission failed: %s", e)
             raise
         finally:
             try:
@@ -7,6 +7,7 @@ import sys
 # Ensure we can import from src
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
+import discovery
 from discovery import run_discovery
 
 # --- Helper to create mock files ---
@@ -74,4 +75,105 @@ def test_discovery_logic(tmp_path):
     assert "test_node_sensors_door_bell" in discovered_ids
     
     # Check that the text file was IGNORED
-    assert "test_node_logs_readme" not in discovered_ids
\ No newline at end of file
+    assert "test_node_logs_readme" not in discovered_ids
+
+
+def test_guess_icon_first_listed_keyword_wins():
+    # "garage" is listed before "door", regardless of where it appears.
+    assert discovery._guess_icon_from_text("Front_Door_Garage") == "mdi:garage"
+    # "lock" is listed before "unlock" and is a substring of it.
+    assert discovery._guess_icon_from_text("unlock") == "mdi:lock"
+    assert discovery._guess_icon_from_text("Heater") == "mdi:fire"
+    assert discovery._guess_icon_from_text("zzz") is None
+    assert discovery._guess_icon_from_text(None) is None
+
+
+def test_discovery_icons_from_sidecar_and_parent_mdi_icon(tmp_path):
+    tx_dir = tmp_path / "tx_files"
+    create_mock_file(tx_dir, "zone", ".mdi-icon")
+    (tx_dir / "zone" / ".mdi-icon").write_text("star\n", encoding="utf-8")
+    create_mock_file(tx_dir / "zone", "nested", "Thing.rfcat.json")
+    create_mock_file(tx_dir, "zone", "Other.sub")
+    (tx_dir / "zone" / "Other.icon").write_text("mdi:home\n", encoding="utf-8")
+
+    config = {
+        'files': {'sub_directory': str(tx_dir), 'node_id': 'n'},
+        'device_info': {},
+    }
+    mock_client = MagicMock()
+    run_discovery(mock_client, config)
+
+    icons = {}
+    for call in mock_client.publish.call_args_list:
+        topic, payload = call[0][0], call[0][1]
+        if topic.startswith("homeassistant/button/") and payload:
+            data = json.loads(payload)
+            icons[data["unique_id"]] = data["icon"]
+
+    assert icons["n_zone_other"] == "mdi:home"
+    # No sidecar/keyword; .rfcat.json extension default wins over the folder icon.
+    assert icons["n_nested_thing"] == "mdi:radio-tower"
+
+    # Folder icon walks up to the nearest .mdi-icon.
+    nested = str(tx_dir / "zone" / "nested")
+    assert discovery._find_folder_icon(nested, str(tx_dir), "mdi:x", {}) == "mdi:star"
+
+
+def test_discovery_subscribes_all_command_topics_in_one_call(tmp_path):
+    tx_dir = tmp_path / "tx_files"
+    create_mock_file(tx_dir, "", "A.sub")
+    create_mock_file(tx_dir, "room", "B.sub")
+
+    config = {'files': {'sub_directory': str(tx_dir), 'node_id': 'n'}, 'device_info': {}}
+    mock_client = MagicMock()
+    topic_map = run_discovery(mock_client, config)
+
+    mock_client.subscribe.assert_called_once_with([(t, 0) for t in topic_map])
+    assert set(topic_map) == {"n/main/a/set", "n/room/b/set"}
+
+
+def test_discovery_button_payload_matches_json_dumps(tmp_path):
+    tx_dir = tmp_path / "tx_files"
+    create_mock_file(tx_dir, "Living_Room", 'Fan "Hi".sub')
+
+    config = {
+        'files': {'sub_directory': str(tx_dir), 'node_id': 'n'},
+        'device_info': {'manufacturer': 'Acme "X"', 'model': 'M\\1'},
+    }
+    mock_client = MagicMock()
+    run_discovery(mock_client, config)
+
+    payloads = [
+        c[0][1] for c in mock_client.publish.call_args_list
+        if c[0][0].startswith("homeassistant/button/")
+    ]
+    assert len(payloads) == 1
+    expected = {
+        "name": 'Fan "Hi"',
+        "unique_id": "n_living_room_fan__hi_",
+        "command_topic": "n/living_room/fan__hi_/set",
+        "payload_press": "PRESS",
+        "icon": "mdi:fan",
+        "device": {
+            "identifiers": ["n_living_room"],
+            "name": "Living Room",
+            "model": "M\\1",
+            "manufacturer": 'Acme "X"',
+            "via_device": "n",
+        },
+    }
+    assert payloads[0] == json.dumps(expected)
+
+
+def test_find_folder_icon_skips_empty_mdi_icon_and_memoizes_parents(tmp_path):
+    top = tmp_path / "tx"
+    (top / "a" / "b" / "c").mkdir(parents=True)
+    (top / ".mdi-icon").write_text("mdi:home\n", encoding="utf-8")
+    (top / "a" / ".mdi-icon").write_text("\n", encoding="utf-8")  # empty -> keep walking
+
+    nearest = {}
+    icon = discovery._find_folder_icon(str(top / "a" / "b" / "c"), str(top), "mdi:x", {}, {}, nearest)
+    assert icon == "mdi:home"
+    # Every ancestor up to the stop dir was resolved once and remembered.
+    assert nearest[str(top / "a" / "b")] == "mdi:home"
+    assert nearest[str(top)] == "mdi:home"
@@ -60,3 +60,18 @@ def test_get_tx_request_unsupported_extension_hits_final_raise(tmp_path):
 
     with pytest.raises(ValueError, match="Unsupported file type"):
         payload.get_tx_request(str(p))
+
+
+def test_on_message_sees_topic_map_from_later_discovery(monkeypatch):
+    import main
+
+    radio = MagicMock()
+    state = main.AppState(config={"files": {"node_id": "n"}}, topic_map={}, radio=radio)
+    on_message = main._on_message_factory(state)
+
+    monkeypatch.setattr(main, "run_discovery", lambda *_a, **_k: {"t/set": "/tmp/a.sub"})
+    monkeypatch.setattr(main, "get_tx_request", lambda _p: {"freq": 1, "payload": b"\x00"})
+    main._on_connect_factory(state)(MagicMock(), None, None, 0)
+
+    on_message(MagicMock(), None, SimpleNamespace(topic="t/set", payload=b"PRESS"))
+    assert radio.transmit.called
@@ -13,21 +13,25 @@ def test_get_source_color_branches():
     assert main._get_source_color("something else") == main.c_green
 
 
-def test_timestamped_print_injects_flush_and_parses_source():
+def test_timestamped_print_flushes_only_problems_and_parses_source():
     calls = []
 
     def fake_print(*args, **kwargs):
         calls.append((args, kwargs))
 
     tp = main._make_timestamped_print(fake_print)
-    tp("[MQTT] hello world")  # no flush passed -> injected
+    tp("[MQTT] hello world")  # INFO/MQTT lines are left to stream buffering
 
     assert calls, "expected fake_print to be called"
     out = calls[-1][0][0]
     kw = calls[-1][1]
-    assert kw.get("flush") is True
+    assert "flush" not in kw
     assert "MQTT" in out
     assert "hello world" in out
+    assert out.endswith("\n") and kw["end"] == ""
+
+    tp("[RfCat] ERROR: boom")
+    assert calls[-1][1].get("flush") is True
 
 
 def test_timestamped_print_preserves_flush_kwarg():
@@ -42,6 +46,44 @@ def test_timestamped_print_preserves_flush_kwarg():
     assert calls[-1][1]["flush"] is False
 
 
+def test_color_enabled_env_and_tty(monkeypatch):
+    tty = SimpleNamespace(isatty=lambda: True)
+    pipe = SimpleNamespace(isatty=lambda: False)
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.delenv("CLICOLOR_FORCE", raising=False)
+    assert main._color_enabled(tty) is True
+    assert main._color_enabled(pipe) is False
+
+    monkeypatch.setenv("CLICOLOR_FORCE", "1")
+    assert main._color_enabled(pipe) is True
+    monkeypatch.setenv("CLICOLOR_FORCE", "0")
+    assert main._color_enabled(tty) is True
+
+    monkeypatch.setenv("NO_COLOR", "1")
+    monkeypatch.setenv("CLICOLOR_FORCE", "1")
+    assert main._color_enabled(tty) is False
+
+
+def test_plain_print_only_prefixes_timestamp():
+    calls = []
+    pp = main._make_plain_print(lambda *a, **k: calls.append((a, k)))
+    pp("[RfCat] ERROR:", "boom")
+
+    out = calls[-1][0][0]
+    assert "\033[" not in out
+    assert out.endswith("] [RfCat] ERROR: boom\n")
+
+
+def test_pick_header_priority_order():
+    assert main._pick_header("[mqtt] connection failed") == main._HDR_ERROR
+    assert main._pick_header("warning: replay skipped") == main._HDR_WARN
+    assert main._pick_header("tx over mqtt") == main._HDR_TX
+    assert main._pick_header("[mqtt] connected") == main._HDR_MQTT
+    assert main._pick_header("hello") == main._HDR_INFO
+    assert main._pick_header("[MQTT] Connection FAILED") == main._HDR_ERROR
+    assert main._pick_header("TX done") == main._HDR_TX
+
+
 def test_install_pretty_print_idempotent(monkeypatch):
     # reset the sentinel for this test
     if hasattr(main.install_pretty_print, "_installed"):
@@ -167,3 +209,69 @@ def test_run_finally_disconnects_even_if_set_offline_raises(monkeypatch):
 
     main.run()
     assert client.disconnect.called
+
+
+
+def test_on_message_enqueues_tx_and_worker_transmits(monkeypatch):
+    radio = MagicMock()
+    q = main.TxQueue(maxsize=1)
+    state = main.AppState(
+        config={"files": {"node_id": "n"}},
+        topic_map={"t/set": "/tmp/a.sub", "u/set": "/tmp/b.sub"},
+        radio=radio,
+        tx_queue=q,
+    )
+    monkeypatch.setattr(main, "get_tx_request", lambda p: {"freq": 1 if p.endswith("a.sub") else 2, "payload": b"\x00"})
+
+    on_message = main._on_message_factory(state)
+    on_message(MagicMock(), None, SimpleNamespace(topic="t/set", payload=b"PRESS"))
+    assert not radio.transmit.called  # only enqueued on the MQTT thread
+
+    # Queue is full: the newest press replaces the oldest instead of blocking.
+    on_message(MagicMock(), None, SimpleNamespace(topic="u/set", payload=b"PRESS"))
+    assert len(q) == 1
+
+    q.close()
+    t = main.threading.Thread(target=main._tx_worker, args=(q,), daemon=True)
+    t.start()
+    t.join(2)
+
+    assert not t.is_alive()
+    assert radio.transmit.call_count == 1
+    assert radio.transmit.call_args.kwargs["freq"] == 2
+
+
+def test_tx_queue_coalesces_pending_presses_per_topic():
+    q = main.TxQueue(maxsize=4)
+    ran = []
+    assert q.put("a", lambda: ran.append("a1")) is None
+    assert q.put("b", lambda: ran.append("b")) is None
+    assert q.put("a", lambda: ran.append("a2")) == "coalesced"
+    q.close()
+
+    main._tx_worker(q)
+    assert ran == ["a2", "b"]  # one burst per topic, original arrival order
+
+
+def test_tx_script_deadline_applies_on_worker_thread(tmp_path, capsys, monkeypatch):
+    # Fake clock: sleeping advances it instantly, so the 1s timeout costs no wall time.
+    now = [0.0]
+
+    def fake_sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(main, "time", SimpleNamespace(monotonic=lambda: now[0], sleep=fake_sleep))
+    script = tmp_path / "slow.py"
+    script.write_text("def run(ctx):\n    ctx.sleep(30)\n    ctx.tx_hex(433920000, 'aa')\n", encoding="utf-8")
+    radio = MagicMock()
+    state = main.AppState(
+        config={"files": {"allow_python_scripts": True, "python_timeout_s": 1}}, topic_map={}, radio=radio
+    )
+
+    t = main.threading.Thread(target=main._execute_python_tx_script, args=(str(script), state))
+    t.start()
+    t.join(10)
+
+    assert not t.is_alive()
+    assert not radio.transmit.called
+    assert "timed out after 1s" in capsys.readouterr().out
@@ -28,6 +28,13 @@ def test_pack_bits_lsb_first_reverses_per_byte():
     assert payload._pack_bits([1, 0, 0, 0, 0, 0, 0, 0], msb_first=False) == b"\x01"
 
 
+def test_pack_bits_multi_byte_pads_last_byte():
+    bits = [0, 0, 0, 0, 0, 0, 0, 1] + [1, 1, 0]
+    assert payload._pack_bits(bits) == b"\x01\xC0"
+    assert payload._pack_bits(bytearray(bits), msb_first=False) == b"\x80\x03"
+    assert payload._pack_bits([]) == b""
+
+
 def test_parse_flipper_sub_basic(tmp_path):
     f = tmp_path / "test.sub"
     f.write_text(FLIPPER_RAW_AA, encoding="utf-8")
@@ -14,7 +14,7 @@ def test_durations_to_bits_min_chip_of_1():
     # chips = round(dur_us * drate / 1e6)
     # Choose values that round to 0 so it hits: if chips < 1: chips = 1
     bits = payload._durations_to_bits([1], drate=10, invert_level=False, max_gap_us=30000)
-    assert bits == [1]
+    assert bits == b"\x01"
 
 
 def test_parse_flipper_sub_raw_index_out_of_range_resets_to_zero(tmp_path):
@@ -39,6 +39,7 @@ def test_hex_to_bytes_pads_odd_length():
     # "a" -> "0a"
     assert payload._hex_to_bytes("a") == b"\x0a"
     assert payload._hex_to_bytes("0xa") == b"\x0a"
+    assert payload._hex_to_bytes("0XDE:ad be\u00b5ef") == b"\xde\xad\xbe\xef"
 
 
 def test_load_rfcat_json_rejects_non_object(tmp_path):
@@ -56,3 +57,45 @@ def test_get_tx_request_rfcat_json_branch(tmp_path):
     tx = payload.get_tx_request(str(p))
     assert tx["freq"] == 433920000
     assert tx["payload"] == b"\xaa"
+
+
+def test_parse_cache_picks_up_file_changes(tmp_path):
+    import os
+
+    f = tmp_path / "c.sub"
+    f.write_text("Frequency: 433920000\nRAW_Data: 1000 -1000\n", encoding="utf-8")
+    assert payload.get_tx_request(str(f))["freq"] == 433920000
+    hits = payload._get_tx_request_cached.cache_info().hits
+    assert payload.get_tx_request(str(f))["freq"] == 433920000
+    assert payload._get_tx_request_cached.cache_info().hits == hits + 1
+
+    f.write_text("Frequency: 315000000\nRAW_Data: 1000 -1000 1000\n", encoding="utf-8")
+    st = os.stat(f)
+    os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert payload.get_tx_request(str(f))["freq"] == 315000000
+
+
+def test_get_tx_request_returns_copy_of_cached_request(tmp_path):
+    p = tmp_path / "k.rfcat.json"
+    p.write_text(json.dumps({"frequency": 433920000, "payload_hex": "aa"}), encoding="utf-8")
+
+    tx = payload.get_tx_request(str(p))
+    tx.update(repeat=1, freq=1)
+
+    again = payload.get_tx_request(str(p))
+    assert again["freq"] == 433920000
+    assert again["repeat"] == 20
+
+
+def test_read_flipper_sub_handles_crlf_and_non_utf8_bytes(tmp_path):
+    f = tmp_path / "w.sub"
+    f.write_bytes(b"Filetype: Flipper SubGhz RAW File\r\n# \xff\xfe\r\nFrequency: 433920000\r\nRAW_Data: 300 -300 600\r\n")
+    freq, raw = payload._read_flipper_sub(str(f))
+    assert freq == 433920000
+    assert raw == [[300, -300, 600]]
+
+
+def test_read_flipper_sub_falls_back_to_regex_for_odd_separators(tmp_path):
+    f = tmp_path / "o.sub"
+    f.write_text("Frequency: 433920000\nRAW_Data: 300,-300, 600\n", encoding="utf-8")
+    assert payload._read_flipper_sub(str(f))[1] == [[300, -300, 600]]
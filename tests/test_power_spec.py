@@ -10,19 +10,19 @@ EXPECTED_POWER_TABLE = {
 
 
 def _assert_poke_called(d, addr: int, byte_value: int) -> None:
-    """Accept either bytes([v]) or [v] depending on poke() implementation."""
+    """addr was written with byte_value, alone or inside a multi-byte poke.
+
+    Accepts bytes, bytearray or list[int] data depending on poke() implementation.
+    """
     for call in d.poke.call_args_list:
         args = call.args
         if len(args) < 2:
             continue
-        if args[0] != addr:
-            continue
-        data = args[1]
-        if data == bytes([byte_value & 0xFF]):
-            return
-        if data == [byte_value & 0xFF]:
-            return
-        if isinstance(data, (bytearray, bytes)) and bytes(data) == bytes([byte_value & 0xFF]):
+        start, data = args[0], args[1]
+        if isinstance(data, str):
+            data = data.encode("latin-1")
+        data = bytes(data)
+        if start <= addr < start + len(data) and data[addr - start] == byte_value & 0xFF:
             return
     raise AssertionError(
         f"poke() never called with addr=0x{addr:04X} value=0x{byte_value:02X}. "
@@ -188,3 +188,87 @@ def test_smart_power_table_matches_spec_if_present():
         pytest.skip("rf.POWER_TABLE not implemented (smart mode not enabled yet)")
 
     assert rf.POWER_TABLE == EXPECTED_POWER_TABLE
+
+
+def test_apply_power_settings_writes_patable_in_one_poke():
+    import rflib
+    import rf
+
+    d = rflib.RfCat.return_value
+    d.reset_mock()
+    d.peek.side_effect = lambda addr, size=1: [0x00] * size
+
+    radio = rf.Radio()
+    radio._apply_power_settings(
+        freq_hz=433_920_000,
+        modulation="ASK_OOK",
+        tx_power_mode="manual",
+        tx_power_target_dbm=0,
+        tx_power_band="auto",
+        frend0_pa_power=3,
+        frend0_lodiv_buf_current_tx=None,
+        patable="0x60",
+    )
+
+    patable_pokes = [c for c in d.poke.call_args_list if c.args[0] != rf.FREND0_ADDR]
+    assert len(patable_pokes) == 1
+    start, data = patable_pokes[0].args
+    assert start == rf.PA_TABLE0_ADDR - 3
+    assert bytes(data) == bytes([0x60, 0x60, 0x60, 0x00])  # PA_TABLE3..PA_TABLE0
+
+
+def test_apply_power_settings_reads_power_span_once_and_skips_unchanged_regs():
+    import rflib
+    import rf
+
+    d = rflib.RfCat.return_value
+    d.reset_mock()
+    # FREND0 already PA_POWER=1; PA_TABLE1=0x60, PA_TABLE0=0x00 already programmed.
+    span = [0x00] * rf._POWER_SPAN_LEN
+    span[0] = 0x01
+    span[-2:] = [0x60, 0x00]
+    d.peek.side_effect = lambda addr, size=1: span[:size] if addr == rf.FREND0_ADDR else [0x00] * size
+
+    radio = rf.Radio()
+    radio._apply_smart_power(
+        freq_hz=433_920_000,
+        is_ask=True,
+        target_dbm=0,
+        band_override="auto",
+        lodiv_buf_current_tx=None,
+    )
+
+    assert [c.args for c in d.peek.call_args_list] == [(rf.FREND0_ADDR, rf._POWER_SPAN_LEN)]
+    assert not d.poke.called
+
+
+def test_smart_plans_follow_power_table():
+    import rf
+
+    for band, codes in EXPECTED_POWER_TABLE.items():
+        for dbm, code in codes.items():
+            assert rf._SMART_PLANS[(band, dbm, True)] == (1, (0x00, code))
+            assert rf._SMART_PLANS[(band, dbm, False)] == (0, (code,))
+
+
+def test_dump_power_regs_reads_span_once_and_skips_when_info_disabled(caplog):
+    import logging
+    import rflib
+    import rf
+
+    d = rflib.RfCat.return_value
+    d.reset_mock()
+    span = list(range(rf._POWER_SPAN_LEN))
+    d.peek.side_effect = lambda addr, size=1: span[:size]
+
+    radio = rf.Radio()
+    d.peek.reset_mock()
+    with caplog.at_level(logging.INFO, logger="RFDriver"):
+        radio._dump_power_regs(prefix="X: ")
+    assert [c.args for c in d.peek.call_args_list] == [(rf.FREND0_ADDR, rf._POWER_SPAN_LEN)]
+    assert "X: Power regs: FREND0=0x00 PA_TABLE0..7=[0x13, 0x12, 0x11, 0x10, 0x0F, 0x0E, 0x0D, 0x0C]" in caplog.text
+
+    d.peek.reset_mock()
+    with caplog.at_level(logging.WARNING, logger="RFDriver"):
+        radio._dump_power_regs()
+    assert not d.peek.called
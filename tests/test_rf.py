@@ -84,3 +84,33 @@ def test_radio_transmit_rejects_unknown_modulation():
     radio = Radio()
     with pytest.raises(ValueError):
         radio.transmit(freq=433_920_000, payload=b"\x00", modulation="NOPE")
+
+
+def test_radio_transmit_skips_unchanged_modem_and_power_setup():
+    import rflib
+    from rf import Radio
+    import pytest
+
+    d = rflib.RfCat.return_value
+    d.reset_mock()
+    radio = Radio()
+
+    for _ in range(2):
+        radio.transmit(freq=433_920_000, payload=b"\x00", drate=1000, tx_power_mode="max")
+    assert d.setFreq.call_count == 1
+    assert d.setMdmDRate.call_count == 1
+    assert d.setMaxPower.call_count == 1
+    assert d.RFxmit.call_count == 2
+
+    radio.transmit(freq=433_920_000, payload=b"\x00", drate=2000, tx_power_mode="max")
+    d.setMdmDRate.assert_called_with(2000)
+    assert d.setMaxPower.call_count == 1
+
+    # A failed TX forgets what was applied.
+    d.RFxmit.side_effect = RuntimeError("usb")
+    with pytest.raises(RuntimeError):
+        radio.transmit(freq=433_920_000, payload=b"\x00", drate=2000, tx_power_mode="max")
+    d.RFxmit.side_effect = None
+    radio.transmit(freq=433_920_000, payload=b"\x00", drate=2000, tx_power_mode="max")
+    assert d.setMdmDRate.call_count == 3
+    assert d.setMaxPower.call_count == 2
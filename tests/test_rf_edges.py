@@ -20,13 +20,18 @@ def test_radio_init_logs_and_raises_when_rflib_rfcat_fails(monkeypatch):
         rflib.RfCat.side_effect = None
 
 
-def test_transmit_importerror_when_rflib_none(monkeypatch):
+def test_transmit_uses_constants_bound_at_import(monkeypatch):
     import rf
+    import rflib
+
     radio = rf.Radio()
+    d = rflib.RfCat.return_value
+    d.reset_mock()
 
+    # An existing Radio no longer looks at the rflib module per call.
     monkeypatch.setattr(rf, "rflib", None)
-    with pytest.raises(ImportError):
-        radio.transmit(freq=433920000, payload=b"\x00")
+    radio.transmit(freq=433920000, payload=b"\x00")
+    d.setMdmModulation.assert_called_with(rflib.MOD_ASK_OOK)
 
 
 def test_transmit_rejects_payload_types():
@@ -55,3 +60,92 @@ def test_transmit_finally_swallows_setmodeidle_error(monkeypatch):
 
     # Reset for other tests
     d.setModeIDLE.side_effect = None
+
+
+def test_parse_patable_csv_forms():
+    import rf
+
+    assert rf._parse_patable(" 0x00 ,, 0x60 ,") == [0x00, 0x60]
+    assert rf._parse_patable("1,2,300") == [1, 2, 300 & 0xFF]
+    assert rf._parse_patable("0x00,zz") is None
+    assert rf._parse_patable(" , ") is None
+
+
+def test_parse_patable_string_cache_returns_fresh_lists():
+    import rf
+
+    first = rf._parse_patable("0x00,0xC0")
+    first.append(0x60)
+    assert rf._parse_patable("0x00,0xC0") == [0x00, 0xC0]
+    assert rf._parse_int("0x1F") == 0x1F
+    assert rf._parse_int(" 0x1F ") == 0x1F
+    assert rf._parse_int("nope") is None
+
+
+def test_xdata_write_remembers_accepted_poke_encoding():
+    import rf
+
+    radio = rf.Radio()
+    seen = []
+
+    def poke(addr, data):
+        seen.append(type(data))
+        if not isinstance(data, bytes):
+            raise TypeError("bytes only")
+
+    radio._poke = poke
+    radio._poke_form = None
+
+    assert radio._xdata_write(rf.FREND0_ADDR, b"\x01") is True
+    assert seen == [list, bytes]
+
+    seen.clear()
+    assert radio._xdata_write(rf.FREND0_ADDR, b"\x02") is True
+    assert seen == [bytes]
+
+
+def test_infer_band_bucket_edges():
+    import rf
+
+    assert rf._infer_band(379_999_999) == 315
+    assert rf._infer_band(380_000_000) == 433
+    assert rf._infer_band(599_999_999) == 433
+    assert rf._infer_band(600_000_000) == 868
+    assert rf._infer_band(900_000_000) == 915
+    assert rf._infer_band(2_400_000_000) == 915
+
+
+def test_frend0_value_replaces_only_selected_fields():
+    import rf
+
+    assert rf._frend0_value(0xFF, 2, None) == 0xFA
+    assert rf._frend0_value(0xFF, 2, 1) == 0xDA
+    assert rf._frend0_value(0x00, 7, 3) == 0x37
+    with pytest.raises(ValueError):
+        rf._frend0_value(0x00, 8, None)
+    with pytest.raises(ValueError):
+        rf._frend0_value(0x00, 1, 4)
+
+
+def test_parse_int_type_dispatch_and_subclasses():
+    import enum
+    import rf
+
+    class Band(enum.IntEnum):
+        B433 = 433
+
+    assert rf._parse_int(None) is None
+    assert rf._parse_int(True) == 1
+    assert rf._parse_int(7) == 7
+    assert rf._parse_int(Band.B433) == 433 and type(rf._parse_int(Band.B433)) is int
+    assert rf._parse_int(1.5) is None
+
+
+def test_parse_patable_list_forms():
+    import rf
+
+    assert rf._parse_patable([0x00, 0xC0]) == [0x00, 0xC0]
+    assert rf._parse_patable([0x1C0, -1]) == [0xC0, 0xFF]
+    assert rf._parse_patable([0, "0xC0"]) == [0x00, 0xC0]
+    assert rf._parse_patable([0, "zz"]) is None
+    assert rf._parse_patable([]) is None